@@ -18,18 +18,38 @@ No Fraud / No circular references.
 """
 
 from __future__ import annotations
+import io
+import os
+import re
 import sys
 import math
+import fnmatch
+import zipfile
 import argparse
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import date, timedelta
+from xml.sax.saxutils import escape as xml_escape
+import xml.etree.ElementTree as ET
 
+import numpy as np
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.cell.cell import Cell
+from openpyxl.workbook.defined_name import DefinedName
 from openpyxl.worksheet.worksheet import Worksheet
 
+try:  # optional: faster multithreaded CSV parsing
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pacsv = None
+
 # ---------------- configuration ----------------
 
 CSV_PATTERNS: Dict[str, List[str]] = {
@@ -42,6 +62,76 @@ CSV_PATTERNS: Dict[str, List[str]] = {
 DEFAULT_WIRED  = "applepay_rep_perf_BANCONTACT_WIRED_hidden.xlsx"
 DEFAULT_READY  = "applepay_rep_perf_BANCONTACT_READY.xlsx"
 
+# Leading bytes inspected to pick a CSV encoding before parsing
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Data_* tabs with at least this many rows skip openpyxl and are written as raw sheet XML
+DIRECT_XML_MIN_ROWS = 10_000
+
+# Workbook names the Metrics formulas use for the Data_Metrics header / value rows
+METRICS_NAMES: Dict[str, str] = {
+    "DM_HDR": "Data_Metrics!$1:$1",
+    "DM_ROW": "Data_Metrics!$2:$2",
+}
+
+# Metrics tab: cell → Data_Metrics header looked up in row 2 (a tuple lists fallbacks)
+METRICS_MAP: List[Tuple[str, Union[str, Tuple[str, ...]]]] = [
+    ("B7", "CNT_DPAN_DEBIT"),
+    ("C7", "CNT_DPAN_CREDIT"),
+    ("D7", ("CNT_DPAN_PP", "CNT_DPAN_POS_PP")),
+    ("B8", "SUM_EXP_DPAN_DEBIT"),
+    ("C8", "SUM_EXP_DPAN_CREDIT"),
+    ("D8", ("SUM_EXP_DPAN_PP", "SUM_EXP_DPAN_POS_PP")),
+    ("B9", "PERC_DPAN_POS_DEBIT"),
+    ("C9", "PERC_DPAN_POS_CREDIT"),
+    ("D9", "PERC_DPAN_POS_PP"),
+    ("B10", "PERC_DPAN_REM_DEBIT"),
+    ("C10", "PERC_DPAN_REM_CREDIT"),
+    ("D10", "PERC_DPAN_REM_PP"),
+    ("B11", "PERC_EXP_DPAN_POS_DEBIT"),
+    ("C11", "PERC_EXP_DPAN_POS_CREDIT"),
+    ("D11", "PERC_EXP_DPAN_POS_PP"),
+    ("B12", "PERC_EXP_DPAN_REM_DEBIT"),
+    ("C12", "PERC_EXP_DPAN_REM_CREDIT"),
+    ("D12", "PERC_EXP_DPAN_REM_PP"),
+    ("B14", "CNT_ACTIVE_DPAN_DEBIT"),
+    ("C14", "CNT_ACTIVE_DPAN_CREDIT"),
+    ("D14", "CNT_ACTIVE_DPAN_PP"),
+]
+
+# Metrics tab: E-column totals / weighted averages built from B..D
+METRICS_TOTALS: List[Tuple[str, str]] = [
+    ("E7", '=SUM(B7:D7)'),
+    ("E8", '=SUM(B8:D8)'),
+    ("E9", '=(B7*B9 + C7*C9 + D7*D9) / IF(E7=0,1,E7)'),
+    ("E10", '=1 - E9'),
+    ("E11", '=(B8*B11 + C8*C11 + D8*D11) / IF(E8=0,1,E8)'),
+    ("E12", '=1 - E11'),
+    ("E14", '=SUM(B14:D14)'),
+]
+
+# Declines tab: (report column, Data_Declines column); {off} = Data_Declines row
+DECLINES_COLUMNS: List[Tuple[int, str]] = [(1, "A"), (2, "B"), (3, "C"), (4, "D"), (6, "E"), (7, "F"), (8, "G")]
+DECLINES_FORMULA = '=IFERROR(INDEX(Data_Declines!${c}:${c},{off}),"")'
+
+# Merchant Report columns A..E ← Data_Merchant headers (matched by name); {off} = data row
+MERCHANT_HEADERS = ["RANK", "NOM_CMR", "PERC", "SPENT", "CNT"]
+
+# Data_* tabs that only need some CSV columns (applied only when all of them are present)
+CSV_USECOLS: Dict[str, List[str]] = {
+    "Data_Merchant": MERCHANT_HEADERS,
+}
+MERCHANT_FORMULA = '=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("{h}",Data_Merchant!$1:$1,0)),"")'
+# same, with the header's column number already resolved from the CSV
+MERCHANT_FORMULA_AT = '=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},{col}),"")'
+
+# OOXML namespaces used when Data_* sheet parts are written directly
+_SHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+# control characters XML 1.0 cannot carry (openpyxl rejects them as well)
+_ILLEGAL_XML_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
 # Sheets that should NOT receive a Reporting Month stamp
 EXCLUDE_REPORTING_MONTH_TOKENS = ("glossary",)  # case-insensitive substring match
 
@@ -57,22 +147,31 @@ def setup_logging(verbose: bool) -> None:
 
 # ---------------- helpers ----------------
 
+@lru_cache(maxsize=1)
 def prev_month_label() -> str:
-    """Return previous month as 'Month YYYY' (based on local system date)."""
+    """Return previous month as 'Month YYYY' (based on local system date, fixed per run)."""
     first = date.today().replace(day=1)
     last_prev = first - timedelta(days=1)
     return last_prev.strftime("%B %Y")
 
 def resolve_csvs(csv_dir: Path) -> Dict[str, Path]:
     found: Dict[str, Path] = {}
+    # list the folder once and match every pattern against the cached names
+    # (regular files only; hidden ones included, as Path.glob matched them)
+    with os.scandir(csv_dir) as it:
+        names = [e.name for e in it if e.is_file()]
+    # literal names are a dict lookup; only wildcard patterns walk the listing
+    by_name = {os.path.normcase(n): n for n in names}
     for sheet, patterns in CSV_PATTERNS.items():
         match: Optional[Path] = None
         for pat in patterns:
-            for p in csv_dir.glob(pat):
-                if p.is_file():
-                    match = p
-                    break
-            if match:
+            if any(ch in pat for ch in "*?["):
+                hits = fnmatch.filter(names, pat)
+            else:
+                hit = by_name.get(os.path.normcase(pat))
+                hits = [hit] if hit else []
+            if hits:
+                match = csv_dir / hits[0]
                 break
         if not match:
             logging.error("Missing CSV for %s (looked for: %s)", sheet, ", ".join(patterns))
@@ -81,40 +180,222 @@ def resolve_csvs(csv_dir: Path) -> Dict[str, Path]:
         logging.info("CSV → %-15s %s", sheet, match.name)
     return found
 
-def read_csv_robust(p: Path) -> pd.DataFrame:
+def sniff_encoding(p: Path) -> str:
+    """Guess a CSV's encoding from its first 64 KiB: UTF-8 if it decodes, else latin-1."""
+    with open(p, "rb") as fh:
+        sample = fh.read(ENCODING_SAMPLE_BYTES)
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multi-byte character cut off by the sample boundary is still UTF-8
+        if e.reason != "unexpected end of data":
+            return "latin1"
+    return "utf-8"
+
+def _csv_columns(p: Path, encoding: str, wanted: Optional[List[str]]) -> Optional[List[str]]:
+    """Header columns to parse (file order), or None for all; every 'wanted' name must exist."""
+    if not wanted:
+        return None
+    try:
+        header = list(pd.read_csv(p, encoding=encoding, nrows=0).columns)
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not all(c in header for c in wanted):
+        return None
+    return [c for c in header if c in wanted]
+
+# pandas' default NA / boolean spellings, given to pyarrow so both readers agree
+_CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+_CSV_TRUE_VALUES = ["True", "TRUE", "true"]
+_CSV_FALSE_VALUES = ["False", "FALSE", "false"]
+
+def _read_csv_arrow(p: Path, encoding: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Multithreaded pyarrow parse; None when the pandas reader should handle the file."""
+    if pacsv is None:
+        return None
     try:
-        df = pd.read_csv(p)
+        table = pacsv.read_csv(
+            p,
+            read_options=pacsv.ReadOptions(use_threads=True, encoding=encoding),
+            convert_options=pacsv.ConvertOptions(
+                null_values=_CSV_NA_VALUES,
+                true_values=_CSV_TRUE_VALUES,
+                false_values=_CSV_FALSE_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid:
+        return None
+    # pandas renames repeated / blank headers (Total.1, Unnamed: N); leave those files to it
+    names = table.column_names
+    if len(set(names)) != len(names) or not all(names):
+        return None
+    if columns:
+        table = table.select(columns)
+    # non-UTF-8 text comes back as binary, dates as date objects (pandas keeps strings)
+    if any(pa.types.is_binary(f.type) or pa.types.is_temporal(f.type) for f in table.schema):
+        return None
+    # all-empty columns are float NaN in pandas, not None objects
+    for i, f in enumerate(table.schema):
+        if pa.types.is_null(f.type):
+            table = table.set_column(i, f.name, table.column(i).cast(pa.float64()))
+    # hand the Arrow buffers over column by column instead of holding both copies
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+# C parser, whole-column dtype inference (no chunked mixed-type guessing), mmap'd input
+_PD_CSV_OPTS = dict(engine="c", low_memory=False, memory_map=True)
+
+def read_csv_robust(p: Path, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    encoding = sniff_encoding(p)
+    # unused columns are never parsed (all columns are kept if any wanted one is missing)
+    columns = _csv_columns(p, encoding, usecols)
+    df = _read_csv_arrow(p, encoding, columns)
+    if df is not None:
+        return df
+    try:
+        df = pd.read_csv(p, encoding=encoding, usecols=columns, **_PD_CSV_OPTS)
     except UnicodeDecodeError:
-        df = pd.read_csv(p, encoding="latin1")
+        # non-UTF-8 bytes past the sniffed sample
+        df = pd.read_csv(p, encoding="latin1", usecols=columns, **_PD_CSV_OPTS)
     return df
 
-def write_dataframe_to_sheet(wb, sheet_name: str, df: pd.DataFrame) -> None:
+def _literal_value(ws: Worksheet, v):
+    """
+    A Data_* value as ws.append should store it, matching _xml_cell: control characters
+    are dropped from text, and '='-prefixed text stays a string instead of a formula.
+    """
+    if not isinstance(v, str):
+        return v
+    v = _ILLEGAL_XML_RE.sub("", v)
+    if v.startswith("="):
+        cell = Cell(ws, value=v)
+        cell.data_type = "s"
+        return cell
+    return v
+
+def write_dataframe_to_sheet(wb, sheet_name: str, df: pd.DataFrame, stream: bool = False) -> int:
+    """
+    (Re)create a hidden Data_* tab holding df; returns its data row count.
+    With stream=True the tab is left empty here; its rows are written as raw
+    sheet XML into the saved file by stream_data_sheets().
+    """
+    # Data_* tabs hold raw values only: drop and recreate (same tab position)
+    # instead of clearing cell by cell, then bulk-append whole rows.
+    index = None
     if sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        if ws.max_row > 0:
-            ws.delete_rows(1, ws.max_row)
-    else:
-        ws = wb.create_sheet(title=sheet_name)
-
-    # headers
-    for j, col in enumerate(df.columns, start=1):
-        ws.cell(row=1, column=j, value=str(col))
-
-    # data rows
-    for i, row in enumerate(df.itertuples(index=False, name=None), start=2):
-        for j, val in enumerate(row, start=1):
-            ws.cell(row=i, column=j, value=val)
+        index = wb.sheetnames.index(sheet_name)
+        wb.remove(wb[sheet_name])
+    ws = wb.create_sheet(title=sheet_name, index=index)
+
+    if not stream:
+        # headers
+        ws.append([_literal_value(ws, h) for h in df.columns.astype(str)])
+
+        # data rows (only non-numeric columns can hold text needing _literal_value)
+        append = ws.append
+        text_cols = [j for j, dt in enumerate(df.dtypes) if not pd.api.types.is_numeric_dtype(dt)]
+        for row in df.itertuples(index=False, name=None):
+            if text_cols:
+                row = list(row)
+                for j in text_cols:
+                    row[j] = _literal_value(ws, row[j])
+            append(row)
 
     ws.sheet_state = "hidden"
     logging.info("Wrote %-15s %5d rows × %d cols (hidden)", sheet_name, len(df), len(df.columns))
+    return len(df)
+
+def _xml_cell(ref: str, v) -> str:
+    if v is None or v is pd.NA or v is pd.NaT:
+        return ""
+    if isinstance(v, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, (int, float, np.integer, np.floating)):
+        if math.isnan(v) or math.isinf(v):
+            return ""
+        return f'<c r="{ref}"><v>{"%.16g" % v}</v></c>'  # same formatting as openpyxl
+    text = xml_escape(_ILLEGAL_XML_RE.sub("", str(v)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def iter_data_sheet_xml(df: pd.DataFrame) -> Iterator[str]:
+    """Yield header + rows of df as a minimal worksheet part (inline strings, no styles), row by row."""
+    letters = [get_column_letter(j) for j in range(1, len(df.columns) + 1)] or ["A"]
+    yield '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    yield f'<worksheet xmlns="{_SHEET_NS}"><dimension ref="A1:{letters[-1]}{len(df) + 1}"/><sheetData>'
+    rows = chain([tuple(df.columns.astype(str))], df.itertuples(index=False, name=None))
+    for r, row in enumerate(rows, start=1):
+        cells = "".join(_xml_cell(f"{col}{r}", v) for col, v in zip(letters, row))
+        yield f'<row r="{r}">{cells}</row>'
+    yield "</sheetData></worksheet>"
+
+def sheet_parts(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet title → worksheet part name inside an xlsx (e.g. 'xl/worksheets/sheet7.xml')."""
+    book = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{_PKG_REL_NS}}}Relationship")}
+    parts: Dict[str, str] = {}
+    for sh in book.iter(f"{{{_SHEET_NS}}}sheet"):
+        target = targets[sh.get(f"{{{_DOC_REL_NS}}}id")]
+        parts[sh.get("name")] = target[1:] if target.startswith("/") else f"xl/{target}"
+    return parts
+
+def stream_data_sheets(payload: bytes, frames: Dict[str, pd.DataFrame]) -> bytes:
+    """Swap the empty Data_* worksheet parts of a saved xlsx for df rows written as raw XML."""
+    if not frames:
+        return payload
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(payload)) as src, \
+         zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        parts = sheet_parts(src)
+        by_part = {parts[name]: df for name, df in frames.items()}
+        for item in src.infolist():
+            df = by_part.get(item.filename)
+            if df is None:
+                dst.writestr(item, src.read(item.filename))
+                continue
+            # write-only style: rows go into the compressed entry as they are produced
+            with dst.open(item.filename, "w") as fh:
+                for chunk in iter_data_sheet_xml(df):
+                    fh.write(chunk.encode("utf-8"))
+    return out.getvalue()
+
+def drop_data_sheets(wb) -> None:
+    """Remove every Data_* tab in one pass, plus workbook names pointing into them."""
+    dropped = {ws.title for ws in wb.worksheets if ws.title.startswith("Data_")}
+    if not dropped:
+        return
+    wb._sheets = [ws for ws in wb._sheets if ws.title not in dropped]
+    refs = tuple(f"{t}!" for t in dropped) + tuple(f"{t}'!" for t in dropped)
+    stale = [n for n, dn in wb.defined_names.items() if any(ref in (dn.attr_text or "") for ref in refs)]
+    for n in stale:
+        del wb.defined_names[n]
+    if wb._active_sheet_index >= len(wb._sheets):
+        wb._active_sheet_index = 0
 
 def _anchor_cell(ws: Worksheet, cell):
     # return the top-left cell of a merged range if 'cell' is inside one
+    # (integer bounds test; no coordinate string parsing per range)
+    r, c = cell.row, cell.column
     for mr in ws.merged_cells.ranges:
-        if cell.coordinate in mr:
+        if mr.min_row <= r <= mr.max_row and mr.min_col <= c <= mr.max_col:
             return ws.cell(row=mr.min_row, column=mr.min_col)
     return cell
 
+def build_merge_index(ws: Worksheet) -> Dict[Tuple[int,int], Cell]:
+    """Map every (row, col) inside a merged range to that range's anchor cell."""
+    idx: Dict[Tuple[int,int], Cell] = {}
+    for mr in ws.merged_cells.ranges:
+        anchor = ws.cell(row=mr.min_row, column=mr.min_col)
+        for rc in mr.cells:
+            idx[rc] = anchor
+    return idx
+
+# characters dropped by to_num before parsing (percent, euro, NBSP, space)
+_NUM_STRIP = str.maketrans("", "", "%€\u00A0 ")
+
 def to_num(v) -> float:
     """Coerce strings like '1 234,56', '€1,234.56', '(123)', '12%' → float."""
     if v is None:
@@ -129,11 +410,9 @@ def to_num(v) -> float:
     neg = s.startswith("(") and s.endswith(")")
     if neg: s = s[1:-1]
     pct = "%" in s
-    s = s.replace("%", "").replace("€", "").replace("\u00A0", " ").replace(" ", "")
-    if s.count(",") > 0 and s.count(".") == 0:
-        s = s.replace(",", ".")
-    else:
-        s = s.replace(",", "")
+    s = s.translate(_NUM_STRIP)
+    if "," in s:
+        s = s.replace(",", ".") if "." not in s else s.replace(",", "")
     try:
         x = float(s)
         if neg: x = -x
@@ -143,33 +422,55 @@ def to_num(v) -> float:
     except Exception:
         return 0.0
 
-def data_nrows(wb, wsname: str, first_col: int = 1) -> int:
-    if wsname not in wb.sheetnames:
-        return 0
-    ws = wb[wsname]
-    r = 2
-    cnt = 0
-    while r <= ws.max_row and ws.cell(row=r, column=first_col).value not in (None, ""):
-        cnt += 1
-        r += 1
-    return cnt
+def to_num_array(s: pd.Series) -> np.ndarray:
+    """Vectorized to_num: pd.to_numeric, then to_num's rules as pandas string ops for the rest."""
+    out = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float, copy=True)
+    bad = np.isnan(out)
+    if bad.any():
+        # locale/currency strings ('1 234,56', '(123)', '12%'): to_num's rules as string ops
+        raw = pd.Series(s.to_numpy(dtype=object)[bad]).astype(str).str.strip()
+        neg = (raw.str.startswith("(") & raw.str.endswith(")")).to_numpy()
+        pct = raw.str.contains("%", regex=False).to_numpy()
+        t = raw.where(~neg, raw.str[1:-1]).str.replace("[%€\u00A0 ]", "", regex=True)
+        t = t.where(~t.str.contains(",", regex=False) | t.str.contains(".", regex=False),
+                    t.str.replace(",", ".", regex=False)).str.replace(",", "", regex=False)
+        x = pd.to_numeric(t, errors="coerce").to_numpy(dtype=float)
+        x = np.where(neg, -x, x)
+        x = np.where(pct, x / 100.0, x)
+        out[bad] = np.nan_to_num(x, nan=0.0, posinf=0.0, neginf=0.0)
+    out[np.isinf(out)] = 0.0
+    return out
 
 def find_label_neighbor(ws: Worksheet, label_text: str) -> Optional[Tuple[int,int,str]]:
     """Find the cell to the right of a label text (case-insensitive)."""
     target = label_text.lower()
     max_r = min(ws.max_row, 60)
     max_c = min(ws.max_column, 30)
-    for r in range(1, max_r + 1):
-        for c in range(1, max_c + 1):
-            v = ws.cell(row=r, column=c).value
+    rows = ws.iter_rows(min_row=1, max_row=max_r, min_col=1, max_col=max_c, values_only=True)
+    for r, row in enumerate(rows, start=1):
+        for c, v in enumerate(row, start=1):
             if isinstance(v, str) and target in v.lower():
-                addr = ws.cell(row=r, column=c+1).coordinate
+                addr = f"{get_column_letter(c+1)}{r}"
                 return (r, c+1, addr)
     return None
 
 # ---------------- Reporting Month (safe) ----------------
 
-def upsert_reporting_month(ws: Worksheet, month_label: str) -> None:
+# sheet title → (row, col) of its Reporting Month label, from the previous pass
+_REPORTING_MONTH_CELLS: Dict[str, Tuple[int,int]] = {}
+
+def _write_reporting_month(ws: Worksheet, r: int, c: int, text: str, month_label: str) -> None:
+    anchor = _anchor_cell(ws, ws.cell(row=r, column=c))
+    if ":" in text.strip():
+        # All-in-one label/value → replace entire text
+        anchor.value = f"Reporting Month: {month_label}"
+    else:
+        # Label-only → write the value in the neighbor cell (anchor-safe)
+        right = ws.cell(row=r, column=c + 1)
+        _anchor_cell(ws, right).value = month_label
+
+def upsert_reporting_month(ws: Worksheet, month_label: str,
+                           hint: Optional[Tuple[int,int]] = None) -> Tuple[int,int]:
     """
     Update or create the 'Reporting Month' on a worksheet.
     - If any cell contains 'Reporting Month' (case-insensitive), update it:
@@ -178,29 +479,37 @@ def upsert_reporting_month(ws: Worksheet, month_label: str) -> None:
         * Else, write <Month YYYY> into the cell to the right.
     - If not found, write 'Reporting Month: <Month YYYY>' to A2.
     Merged-cell safe: always writes to the anchor cell; never clears neighbors.
+    'hint' is the (row, col) returned by an earlier pass; it is tried before scanning.
+    Returns the (row, col) of the label cell.
     """
+    if hint is not None:
+        val = ws.cell(row=hint[0], column=hint[1]).value
+        if isinstance(val, str) and "reporting month" in val.lower():
+            _write_reporting_month(ws, hint[0], hint[1], val, month_label)
+            return hint
+
+    # header banners are usually one merged range across row 2: check those anchors first
+    for mr in ws.merged_cells.ranges:
+        if mr.min_row <= 2 <= mr.max_row:
+            val = ws.cell(row=mr.min_row, column=mr.min_col).value
+            if isinstance(val, str) and "reporting month" in val.lower():
+                _write_reporting_month(ws, mr.min_row, mr.min_col, val, month_label)
+                return (mr.min_row, mr.min_col)
+
     # scan top area for a label
     max_r = min(ws.max_row, 10)
     max_c = min(ws.max_column, 30)
-    for r in range(1, max_r + 1):
-        for c in range(1, max_c + 1):
-            cell = ws.cell(row=r, column=c)
-            val = cell.value
+    rows = ws.iter_rows(min_row=1, max_row=max_r, min_col=1, max_col=max_c, values_only=True)
+    for r, row in enumerate(rows, start=1):
+        for c, val in enumerate(row, start=1):
             if isinstance(val, str) and "reporting month" in val.lower():
-                anchor = _anchor_cell(ws, cell)
-                text = val.strip()
-                if ":" in text:
-                    # All-in-one label/value → replace entire text
-                    anchor.value = f"Reporting Month: {month_label}"
-                else:
-                    # Label-only → write the value in the neighbor cell (anchor-safe)
-                    right = ws.cell(row=r, column=c + 1)
-                    _anchor_cell(ws, right).value = month_label
-                return
+                _write_reporting_month(ws, r, c, val, month_label)
+                return (r, c)
 
     # No existing label found → create it at A2
     a2 = _anchor_cell(ws, ws["A2"])
     a2.value = f"Reporting Month: {month_label}"
+    return (a2.row, a2.column)
 
 def set_reporting_month_on_workbook(wb) -> None:
     """Apply Reporting Month to all visible report sheets except excluded ones."""
@@ -212,60 +521,52 @@ def set_reporting_month_on_workbook(wb) -> None:
             continue
         if any(tok in lname for tok in EXCLUDE_REPORTING_MONTH_TOKENS):
             continue
-        upsert_reporting_month(ws, label)
+        # WIRED and READY share sheet geometry: reuse the label cell found first
+        _REPORTING_MONTH_CELLS[name] = upsert_reporting_month(ws, label, _REPORTING_MONTH_CELLS.get(name))
 
 # ---------------- wire visible sheets (no Fraud) ----------------
 
-def wire_visible_sheets(wb) -> None:
+def metrics_formula(names: Union[str, Tuple[str, ...]], header: Optional[List[str]] = None) -> str:
+    """
+    INDEX into Data_Metrics row 2 (DM_ROW); each extra header is tried if the previous is missing.
+    With the CSV header known, the first present name is resolved to its column number here
+    (no MATCH in the formula); otherwise the lookup is left to Excel.
+    """
+    names = (names,) if isinstance(names, str) else names
+    if header is not None:
+        for name in names:
+            if name in header:
+                return f'=IFERROR(INDEX(DM_ROW,1,{header.index(name) + 1}),"")'
+    expr = '""'
+    for name in reversed(names):
+        expr = f'IFERROR(INDEX(DM_ROW,1,MATCH("{name}",DM_HDR,0)),{expr})'
+    return "=" + expr
+
+def wire_visible_sheets(wb, row_counts: Dict[str, int], headers: Dict[str, List[str]]) -> None:
     # Metrics
     if "Metrics" in wb.sheetnames and "Data_Metrics" in wb.sheetnames:
         ws = wb["Metrics"]
-        ws["B7"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_DPAN_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C7"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_DPAN_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D7"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_DPAN_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E7"].value  = '=SUM(B7:D7)'
-        ws["B8"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("SUM_EXP_DPAN_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C8"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("SUM_EXP_DPAN_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D8"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("SUM_EXP_DPAN_PP",Data_Metrics!$1:$1,0)),IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("SUM_EXP_DPAN_POS_PP",Data_Metrics!$1:$1,0)),""))'
-        ws["E8"].value  = '=SUM(B8:D8)'
-        ws["B9"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_POS_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C9"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_POS_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D9"].value  = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_POS_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E9"].value  = '=(B7*B9 + C7*C9 + D7*D9) / IF(E7=0,1,E7)'
-        ws["B10"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_REM_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C10"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_REM_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D10"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_DPAN_REM_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E10"].value = '=1 - E9'
-        ws["B11"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_POS_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C11"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_POS_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D11"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_POS_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E11"].value = '=(B8*B11 + C8*C11 + D8*D11) / IF(E8=0,1,E8)'
-        ws["B12"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_REM_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C12"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_REM_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D12"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("PERC_EXP_DPAN_REM_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E12"].value = '=1 - E11'
-        ws["B14"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_ACTIVE_DPAN_DEBIT",Data_Metrics!$1:$1,0)),"")'
-        ws["C14"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_ACTIVE_DPAN_CREDIT",Data_Metrics!$1:$1,0)),"")'
-        ws["D14"].value = '=IFERROR(INDEX(Data_Metrics!$1:$1048576,2,MATCH("CNT_ACTIVE_DPAN_PP",Data_Metrics!$1:$1,0)),"")'
-        ws["E14"].value = '=SUM(B14:D14)'
+        for name, ref in METRICS_NAMES.items():
+            wb.defined_names[name] = DefinedName(name, attr_text=ref)
+        for coord, names in METRICS_MAP:
+            ws.cell(row=int(coord[1:]), column=ord(coord[0]) - 64, value=metrics_formula(names, headers.get("Data_Metrics")))
+        for coord, formula in METRICS_TOTALS:
+            ws.cell(row=int(coord[1:]), column=ord(coord[0]) - 64, value=formula)
         # IMPORTANT: do NOT write any helper next to 'Monthly DPAN transaction count' in WIRED.
 
     # Declines + cosmetics
     if "Declines" in wb.sheetnames and "Data_Declines" in wb.sheetnames:
         ws = wb["Declines"]
-        n = data_nrows(wb, "Data_Declines")
+        n = row_counts.get("Data_Declines", 0)
+        # column part of each template filled once; only {off} varies per row
+        fmts = [(col, DECLINES_FORMULA.format(c=c, off="{off}").format) for col, c in DECLINES_COLUMNS]
         for i in range(n):
-            r = 8 + i; off = i + 2
-            ws[f"A{r}"].value = f'=IFERROR(INDEX(Data_Declines!$A:$A,{off}),"")'
-            ws[f"B{r}"].value = f'=IFERROR(INDEX(Data_Declines!$B:$B,{off}),"")'
-            ws[f"C{r}"].value = f'=IFERROR(INDEX(Data_Declines!$C:$C,{off}),"")'
-            ws[f"D{r}"].value = f'=IFERROR(INDEX(Data_Declines!$D:$D,{off}),"")'
-            ws[f"F{r}"].value = f'=IFERROR(INDEX(Data_Declines!$E:$E,{off}),"")'
-            ws[f"G{r}"].value = f'=IFERROR(INDEX(Data_Declines!$F:$F,{off}),"")'
-            ws[f"H{r}"].value = f'=IFERROR(INDEX(Data_Declines!$G:$G,{off}),"")'
+            r = 8 + i
+            for col, fmt in fmts:
+                ws.cell(row=r, column=col, value=fmt(off=i + 2))
         labels = ["Transaction Size","< 10€","€10 - €25","€25 - €50","€50 - €100","€100 - €250","€250 - €1000",">= €1000","Total"]
         for i, text in enumerate(labels, start=7):
-            ws[f"A{i}"].value = text
+            ws.cell(row=i, column=1, value=text)
         ws["A17"].value = "* Leave cell blank if not applicable"
         ws["B15"].value = "=SUM(B8:B14)"; ws["C15"].value = "=SUM(C8:C14)"
         ws["F15"].value = "=SUM(F8:F14)"; ws["G15"].value = "=SUM(G8:G14)"
@@ -274,130 +575,118 @@ def wire_visible_sheets(wb) -> None:
     if "Usage Frequency" in wb.sheetnames and "Data_Usage" in wb.sheetnames:
         ws = wb["Usage Frequency"]
         for r in range(8,19):
-            ws[f"F{r}"].value = f'=IFERROR(INDEX(Data_Usage!$1:$2,2,MATCH($B{r},Data_Usage!$1:$1,0)),"")'
-            ws[f"G{r}"].value = f'=IFERROR(IF($F{r}=0,0,$F{r}/$F$19),"")'
+            ws.cell(row=r, column=6, value=f'=IFERROR(INDEX(Data_Usage!$1:$2,2,MATCH($B{r},Data_Usage!$1:$1,0)),"")')
+            ws.cell(row=r, column=7, value=f'=IFERROR(IF($F{r}=0,0,$F{r}/$F$19),"")')
         ws["F19"].value = "=SUM(F8:F18)"
 
     # Merchant Report (header-safe)
     if "Merchant Report" in wb.sheetnames and "Data_Merchant" in wb.sheetnames:
         ws = wb["Merchant Report"]
+        hdr = headers.get("Data_Merchant", [])
+        fmts = [(MERCHANT_FORMULA_AT.format(col=hdr.index(h) + 1, off="{off}") if h in hdr
+                 else MERCHANT_FORMULA.format(h=h, off="{off}")).format for h in MERCHANT_HEADERS]
         for i in range(100):
-            r = 7 + i; off = i + 2
-            ws[f"A{r}"].value = f'=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("RANK",Data_Merchant!$1:$1,0)),"")'
-            ws[f"B{r}"].value = f'=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("NOM_CMR",Data_Merchant!$1:$1,0)),"")'
-            ws[f"C{r}"].value = f'=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("PERC",Data_Merchant!$1:$1,0)),"")'
-            ws[f"D{r}"].value = f'=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("SPENT",Data_Merchant!$1:$1,0)),"")'
-            ws[f"E{r}"].value = f'=IFERROR(INDEX(Data_Merchant!$1:$1048576,{off},MATCH("CNT",Data_Merchant!$1:$1,0)),"")'
+            r = 7 + i
+            for col, fmt in enumerate(fmts, start=1):
+                ws.cell(row=r, column=col, value=fmt(off=i + 2))
 
 # ---------------- READY (values only) ----------------
 
-def create_ready_values_only(wb_src, ready_path: Path) -> None:
-    """Write values into visible sheets, drop Data_* tabs, stamp Reporting Month, and save READY."""
-    def df_from_sheet(name: str) -> Optional[pd.DataFrame]:
-        if name not in wb_src.sheetnames:
+def create_ready_values_only(wb_src, ready_path: Path, frames: Dict[str, pd.DataFrame]) -> None:
+    """
+    Write values into visible sheets, drop Data_* tabs, stamp Reporting Month, and save READY.
+    Data_* values come from the DataFrames already parsed from the CSVs (frames), not the saved file.
+    """
+    def df_from_frames(name: str) -> Optional[pd.DataFrame]:
+        df = frames.get(name)
+        if df is None:
             return None
-        ws = wb_src[name]
-        headers = [str(c.value) if c.value is not None else "" for c in ws[1]]
-        rows = []
-        r = 2
-        while r <= ws.max_row and ws.cell(row=r, column=1).value not in (None, ""):
-            rows.append([ws.cell(row=r, column=c).value for c in range(1, len(headers)+1)])
-            r += 1
-        return pd.DataFrame(rows, columns=headers) if rows else pd.DataFrame(columns=headers)
-
-    dm = df_from_sheet("Data_Metrics")
-    dd = df_from_sheet("Data_Declines")
-    du = df_from_sheet("Data_Usage")
-    dmerch = df_from_sheet("Data_Merchant")
-
-    def set_val(ws: Worksheet, addr: str, val):
-        _anchor_cell(ws, ws[addr]).value = None if val is None else val
+        df = df.astype(object).where(df.notna(), None)
+        if len(df.columns):
+            # data rows stop at the first blank in column A
+            blank = df.iloc[:, 0].map(lambda v: v is None or v == "").to_numpy()
+            if blank.any():
+                df = df.iloc[:int(blank.argmax())]
+        return df
+
+    dm = df_from_frames("Data_Metrics")
+    dd = df_from_frames("Data_Declines")
+    du = df_from_frames("Data_Usage")
+    dmerch = df_from_frames("Data_Merchant")
+
+    merge_idx: Dict[str, Dict[Tuple[int,int], Cell]] = {}
+
+    def set_val(ws: Worksheet, row: int, col: int, val):
+        # merged ranges are indexed once per sheet instead of scanned per write
+        idx = merge_idx.get(ws.title)
+        if idx is None:
+            idx = merge_idx[ws.title] = build_merge_index(ws)
+        cell = idx.get((row, col))
+        if cell is None:
+            cell = ws.cell(row=row, column=col)
+        cell.value = None if val is None else val
 
     # Metrics (values)
     if "Metrics" in wb_src.sheetnames and dm is not None and not dm.empty:
         ws = wb_src["Metrics"]
         row = dm.iloc[0].to_dict()
-        b7 = to_num(row.get("CNT_DPAN_DEBIT", 0))
-        c7 = to_num(row.get("CNT_DPAN_CREDIT", 0))
-        d7 = to_num(row.get("CNT_DPAN_PP", row.get("CNT_DPAN_POS_PP", 0)))
-        e7 = b7 + c7 + d7
-        for a, v in [("B7", b7), ("C7", c7), ("D7", d7), ("E7", e7)]: set_val(ws, a, v)
-
-        b8 = to_num(row.get("SUM_EXP_DPAN_DEBIT", 0))
-        c8 = to_num(row.get("SUM_EXP_DPAN_CREDIT", 0))
-        d8 = to_num(row.get("SUM_EXP_DPAN_PP", row.get("SUM_EXP_DPAN_POS_PP", 0)))
-        e8 = b8 + c8 + d8
-        for a, v in [("B8", b8), ("C8", c8), ("D8", d8), ("E8", e8)]: set_val(ws, a, v)
-
-        b9 = to_num(row.get("PERC_DPAN_POS_DEBIT", 0))
-        c9 = to_num(row.get("PERC_DPAN_POS_CREDIT", 0))
-        d9 = to_num(row.get("PERC_DPAN_POS_PP", 0))
-        e9 = (b7*b9 + c7*c9 + d7*d9) / (e7 or 1.0)
-        for a, v in [("B9", b9), ("C9", c9), ("D9", d9), ("E9", e9)]: set_val(ws, a, v)
-
-        b10 = to_num(row.get("PERC_DPAN_REM_DEBIT", 0))
-        c10 = to_num(row.get("PERC_DPAN_REM_CREDIT", 0))
-        d10 = to_num(row.get("PERC_DPAN_REM_PP", 0))
-        e10 = 1.0 - e9
-        for a, v in [("B10", b10), ("C10", c10), ("D10", d10), ("E10", e10)]: set_val(ws, a, v)
-
-        b11 = to_num(row.get("PERC_EXP_DPAN_POS_DEBIT", 0))
-        c11 = to_num(row.get("PERC_EXP_DPAN_POS_CREDIT", 0))
-        d11 = to_num(row.get("PERC_EXP_DPAN_POS_PP", 0))
-        e11 = (b8*b11 + c8*c11 + d8*d11) / (e8 or 1.0)
-        for a, v in [("B11", b11), ("C11", c11), ("D11", d11), ("E11", e11)]: set_val(ws, a, v)
-
-        b12 = to_num(row.get("PERC_EXP_DPAN_REM_DEBIT", 0))
-        c12 = to_num(row.get("PERC_EXP_DPAN_REM_CREDIT", 0))
-        d12 = to_num(row.get("PERC_EXP_DPAN_REM_PP", 0))
-        e12 = 1.0 - e11
-        for a, v in [("B12", b12), ("C12", c12), ("D12", d12), ("E12", e12)]: set_val(ws, a, v)
-
-        b14 = to_num(row.get("CNT_ACTIVE_DPAN_DEBIT", 0))
-        c14 = to_num(row.get("CNT_ACTIVE_DPAN_CREDIT", 0))
-        d14 = to_num(row.get("CNT_ACTIVE_DPAN_PP", 0))
-        e14 = b14 + c14 + d14
-        for a, v in [("B14", b14), ("C14", c14), ("D14", d14), ("E14", e14)]: set_val(ws, a, v)
+        v: Dict[str, float] = {}
+        for coord, names in METRICS_MAP:
+            # first header present wins (same fallbacks as the WIRED formulas)
+            keys = (names,) if isinstance(names, str) else names
+            v[coord] = to_num(next((row[k] for k in keys if k in row), 0))
+        # E column mirrors METRICS_TOTALS
+        for r in (7, 8, 14):
+            v[f"E{r}"] = v[f"B{r}"] + v[f"C{r}"] + v[f"D{r}"]
+        for share, base in ((9, 7), (11, 8)):
+            weighted = sum(v[f"{c}{base}"] * v[f"{c}{share}"] for c in "BCD")
+            v[f"E{share}"] = weighted / (v[f"E{base}"] or 1.0)
+            v[f"E{share + 1}"] = 1.0 - v[f"E{share}"]
+        for coord, x in v.items():
+            set_val(ws, int(coord[1:]), ord(coord[0]) - 64, x)
 
     # Declines (values + totals)
     if "Declines" in wb_src.sheetnames and dd is not None and not dd.empty:
         ws = wb_src["Declines"]
         n = len(dd)
-        for i in range(n):
-            r = 8 + i
-            for (col, idx) in [("B",1),("C",2),("D",3),("F",4),("G",5),("H",6)]:
-                v = dd.iloc[i, idx] if idx < dd.shape[1] else None
-                set_val(ws, f"{col}{r}", to_num(v))
-        def sum_col(c: str) -> float:
-            return sum(to_num(ws[f"{c}{rr}"].value) for rr in range(8, 15))
-        set_val(ws, "B15", sum_col("B")); set_val(ws, "C15", sum_col("C"))
-        set_val(ws, "F15", sum_col("F")); set_val(ws, "G15", sum_col("G"))
+        cols, idxs = (2, 3, 4, 6, 7, 8), (1, 2, 3, 4, 5, 6)
+        block = np.column_stack([to_num_array(dd.iloc[:, idx]) if idx < dd.shape[1] else np.zeros(n)
+                                 for idx in idxs])
+        # one row-major pass over plain floats
+        for r, row in enumerate(block.tolist(), start=8):
+            for col, v in zip(cols, row):
+                set_val(ws, r, col, v)
+        totals = dict(zip(cols, block[:7].sum(axis=0).tolist()))  # rows 8..14
+        for col in (2, 3, 6, 7):
+            set_val(ws, 15, col, totals[col])
 
     # Usage Frequency (values)
     if "Usage Frequency" in wb_src.sheetnames and du is not None and not du.empty:
         ws = wb_src["Usage Frequency"]
         vals = du.iloc[0].to_dict()
-        for r in range(8,19):
-            ws[f"F{r}"].value = to_num(vals.get(ws[f"B{r}"].value, 0))
-        total = sum(to_num(ws[f"F{r}"].value) for r in range(8,19))
-        ws["F19"].value = total
-        for r in range(8,19):
-            fv = to_num(ws[f"F{r}"].value)
-            ws[f"G{r}"].value = (fv / total) if total else 0.0
+        labels = [row[0] for row in ws.iter_rows(min_row=8, max_row=18, min_col=2, max_col=2, values_only=True)]
+        f_arr = np.fromiter((to_num(vals.get(lab, 0)) for lab in labels), dtype=float, count=len(labels))
+        total = float(f_arr.sum())
+        g_arr = f_arr / total if total else np.zeros_like(f_arr)
+        for r, fv, gv in zip(range(8,19), f_arr.tolist(), g_arr.tolist()):
+            ws.cell(row=r, column=6).value = fv
+            ws.cell(row=r, column=7).value = gv
+        ws.cell(row=19, column=6).value = total
 
     # Merchant (values)
     if "Merchant Report" in wb_src.sheetnames and dmerch is not None and not dmerch.empty:
         ws = wb_src["Merchant Report"]
-        for i in range(min(100, len(dmerch))):
-            r = 7 + i
-            for j, col in enumerate(["RANK","NOM_CMR","PERC","SPENT","CNT"], start=1):
-                if col in dmerch.columns:
-                    ws[f"{'ABCDE'[j-1]}{r}"].value = dmerch.iloc[i][col]
+        present = [(j, col) for j, col in enumerate(MERCHANT_HEADERS, start=1)
+                   if col in dmerch.columns]
+        # only the first 100 rows are sliced out, then read as one ndarray
+        arr = dmerch.head(100)[[col for _, col in present]].to_numpy(dtype=object)
+        cell = ws.cell
+        for r, row in enumerate(arr, start=7):
+            for (j, _), v in zip(present, row):
+                cell(row=r, column=j).value = v
 
     # Drop Data_* tabs
-    for name in list(wb_src.sheetnames):
-        if name.startswith("Data_"):
-            wb_src.remove(wb_src[name])
+    drop_data_sheets(wb_src)
 
     # Stamp Reporting Month on READY as well
     set_reporting_month_on_workbook(wb_src)
@@ -445,19 +734,34 @@ def main() -> int:
         return 2
 
     # Update Data_* tabs
-    for sheet, path in resolved.items():
-        df = read_csv_robust(path)
-        write_dataframe_to_sheet(wb, sheet, df)
+    # (large ones bypass openpyxl: their rows are streamed into the saved file as sheet XML)
+    row_counts: Dict[str, int] = {}
+    headers: Dict[str, List[str]] = {}
+    streamed: Dict[str, pd.DataFrame] = {}
+    # CSVs are independent: parse them concurrently (pyarrow and the C parser release
+    # the GIL), then touch the workbook from this thread only, in sheet order
+    with ThreadPoolExecutor(max_workers=len(resolved)) as ex:
+        usecols = [CSV_USECOLS.get(sheet) for sheet in resolved]
+        frames = dict(zip(resolved, ex.map(read_csv_robust, resolved.values(), usecols)))
+    for sheet, df in frames.items():
+        stream = len(df) >= DIRECT_XML_MIN_ROWS
+        row_counts[sheet] = write_dataframe_to_sheet(wb, sheet, df, stream=stream)
+        headers[sheet] = [str(c) for c in df.columns]
+        if stream:
+            streamed[sheet] = df
 
     # Wire formulas / cosmetics
-    wire_visible_sheets(wb)
+    wire_visible_sheets(wb, row_counts, headers)
 
     # Stamp Reporting Month (previous month) on all report sheets except Glossary
     set_reporting_month_on_workbook(wb)
 
-    # Save WIRED
+    # Save WIRED (serialized once, streamed Data_* parts spliced into the bytes)
+    buf = io.BytesIO()
+    wb.save(buf)
+    payload = stream_data_sheets(buf.getvalue(), streamed)
     try:
-        wb.save(wired_path)
+        wired_path.write_bytes(payload)
     except PermissionError:
         logging.error("Close '%s' in Excel and run again.", wired_path.name)
         return 2
@@ -465,8 +769,10 @@ def main() -> int:
 
     # READY (values-only)
     if not args.no_ready:
-        wb_ready = load_workbook(wired_path, data_only=False, keep_links=True)
-        create_ready_values_only(wb_ready, ready_path)
+        # reopen the pre-splice bytes: saving wb twice fails (openpyxl closes image
+        # streams on save), and streamed Data_* tabs are still empty there
+        wb_ready = load_workbook(io.BytesIO(buf.getvalue()), keep_links=True)
+        create_ready_values_only(wb_ready, ready_path, frames)
 
     return 0
 